@@ -1,10 +1,21 @@
 import pandas as pd
 
-# Read the train.csv file
-df = pd.read_csv("data/processed/train.csv", sep=";")
+# Read only the 'uid' and 'question' columns in chunks so the full
+# file is never materialized in memory
+reader = pd.read_csv(
+    "data/processed/train.csv",
+    sep=";",
+    usecols=["uid", "question"],
+    dtype="string",
+    chunksize=200_000,
+)
 
-# Extract only the 'uid' and 'question' columns
-parsed_df = df[["uid", "question"]]
-
-# Save to new file
-parsed_df.to_csv("data/processed/parsed_train_test.csv", sep=";", index=False)
+# Append each chunk to the output file as it is parsed
+for i, chunk in enumerate(reader):
+    chunk.to_csv(
+        "data/processed/parsed_train_test.csv",
+        sep=";",
+        index=False,
+        header=(i == 0),
+        mode="w" if i == 0 else "a",
+    )
@@ -49,7 +49,13 @@ test_path = "data/processed/test_from_train.csv"  # тестовый файл
     type=click.Path(exists=True),
     help="Путь к файлу submission для проверки. По умолчанию: data/processed/submission.csv",
 )
-def main(submission_file: Optional[str]) -> int:
+@click.option(
+    "--strict",
+    is_flag=True,
+    default=False,
+    help="Прервать валидацию без детального разбора, если количество строк не совпадает с test.csv",
+)
+def main(submission_file: Optional[str], strict: bool) -> int:
     """Валидировать submission файл для хакатона"""
 
     print("🚀 Запуск валидации submission файла...")
@@ -65,7 +71,7 @@ def main(submission_file: Optional[str]) -> int:
 
     try:
         validator = SubmissionValidator(
-            test_path=test_path, submission_path=submission_file
+            test_path=test_path, submission_path=submission_file, strict=strict
         )
         results = validator.run_all_validations()
     except FileNotFoundError as e:
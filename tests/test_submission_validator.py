@@ -1,13 +1,41 @@
-import csv
+import functools
 import os
-from typing import List, Set, Optional
+import re
 from pathlib import Path
+from typing import FrozenSet, Iterator, List, Optional
+
+import numpy as np
 
 current_dir = Path(__file__).parent
 submission_path = current_dir.parent / "data" / "processed" / "submission.csv"
 # test_path = current_dir.parent / "data" / "processed" / "test_.csv"
 
 
+@functools.lru_cache(maxsize=4)
+def _load_test_uids(file_path: str, mtime_ns: int, size: int) -> FrozenSet[bytes]:
+    """
+    Потоковое чтение только колонки uid из CSV файла.
+
+    Результат кэшируется по (путь, mtime, размер): при повторных
+    валидациях неизменившийся test файл не перечитывается с диска.
+
+    Args:
+        file_path: Путь к файлу
+        mtime_ns: Время изменения файла (ключ кэша)
+        size: Размер файла (ключ кэша)
+
+    Returns:
+        Множество uid (в байтах)
+    """
+    # Буфер в 1 МБ вместо 8 КБ по умолчанию — меньше syscall'ов
+    # на многомегабайтных файлах
+    with open(file_path, "rb", buffering=1 << 20) as f:
+        next(f, None)  # Пропускаем заголовок
+        return frozenset(
+            line.split(b";", 1)[0].strip() for line in f if line.strip()
+        )
+
+
 class SubmissionValidator:
     """
     Валидатор submission файла.
@@ -23,10 +51,14 @@ class SubmissionValidator:
     - Уникальность uid
     """
 
+    #: Заголовок submission файла
+    HEADER = [b"uid", b"type", b"request"]
+
     def __init__(
         self,
         test_path: str,
         submission_path: Optional[str] = None,
+        strict: bool = False,
     ):
 
         # Устанавливаем путь по умолчанию, если не указан
@@ -36,15 +68,48 @@ class SubmissionValidator:
             self.submission_path = Path(submission_path)
 
         self.test_path = current_dir.parent / test_path
-        self.valid_methods = {
-            "GET",
-            "POST",
-            "PUT",
-            "DELETE",
-            "PATCH",
-            "HEAD",
-            "OPTIONS",
-        }
+        # Пути конвертируются в str один раз: open/stat/exists дальше
+        # работают без __fspath__ на каждый вызов
+        self._submission_str = (
+            os.fspath(self.submission_path)
+            if self.submission_path is not None
+            else None
+        )
+        self._test_str = os.fspath(self.test_path)
+        # В строгом режиме расхождение количества строк прерывает
+        # валидацию без детального разбора файла
+        self.strict = strict
+        # Методы храним как bytes: проверки идут по сырым байтам файла,
+        # без декодирования каждой ячейки в str
+        self.valid_methods = frozenset(
+            {
+                b"GET",
+                b"POST",
+                b"PUT",
+                b"DELETE",
+                b"PATCH",
+                b"HEAD",
+                b"OPTIONS",
+            }
+        )
+        # Сортированный список методов для сообщений об ошибках
+        # формируем один раз
+        self._valid_methods_str = ", ".join(
+            sorted(m.decode() for m in self.valid_methods)
+        )
+        # Полностью валидная строка распознаётся одним проходом
+        # regex-движка; в разбор по ячейкам попадают только ошибочные
+        self._line_re = re.compile(
+            rb"^([^;]+);(?:" + rb"|".join(sorted(self.valid_methods)) + rb");/[^;]*\r?$"
+        )
+        # Тот же шаблон в multiline-режиме: findall по всему буферу
+        # проверяет все строки сразу, без питоновского цикла
+        self._block_re = re.compile(
+            rb"^([^;\n]+);(?:"
+            + rb"|".join(sorted(self.valid_methods))
+            + rb");/[^;\n]*\r?$",
+            re.MULTILINE,
+        )
 
     def run_all_validations(self) -> List[tuple]:
         """
@@ -56,7 +121,7 @@ class SubmissionValidator:
         results = []
 
         # Проверка наличия файла submission
-        if not self.submission_path.exists():
+        if not os.path.exists(self._submission_str):
             results.append(
                 (
                     "Проверка наличия submission файла",
@@ -69,7 +134,7 @@ class SubmissionValidator:
         results.append(("Проверка наличия submission файла", True, None))
 
         # Проверка наличия файла test
-        if not self.test_path.exists():
+        if not os.path.exists(self._test_str):
             results.append(
                 (
                     "Проверка наличия test файла",
@@ -82,115 +147,225 @@ class SubmissionValidator:
         results.append(("Проверка наличия test файла", True, None))
 
         try:
-            # Чтение файлов
-            submission_data = self._read_csv(self.submission_path)
-            test_data = self._read_csv(self.test_path)
+            st = os.stat(self._test_str)
+            test_uid_set = _load_test_uids(
+                self._test_str, st.st_mtime_ns, st.st_size
+            )
+
+            # Проверка соответствия количества строк: дешёвый подсчёт
+            # переводов строки блоками по 1 МБ до полного разбора файла
+            num_rows = self._count_rows(self._submission_str)
+            if num_rows != len(test_uid_set):
+                results.append(
+                    (
+                        "Проверка соответствия количества строк",
+                        False,
+                        f"Некорректное количество строк: ожидается {len(test_uid_set)}, найдено {num_rows}",
+                    )
+                )
+                if self.strict:
+                    # Файл заведомо невалиден — детальный разбор не нужен
+                    return results
+            else:
+                results.append(("Проверка соответствия количества строк", True, None))
+
+            # Файл читается целиком и разбирается прямо по байтам:
+            # ни одна ячейка не декодируется в str, пока не понадобится
+            # в сообщении об ошибке
+            data = self._read_bytes(self._submission_str)
 
             # Проверка структуры submission файла
-            if len(submission_data) == 0:
+            if not data.strip():
                 results.append(
                     ("Проверка структуры файла", False, "Файл submission.csv пуст")
                 )
                 return results
 
-            if not all(len(row) == 3 for row in submission_data):
+            header_end = data.find(b"\n")
+            header_line = data if header_end == -1 else data[:header_end]
+            # Excel-подобные экспорты начинаются с UTF-8 BOM —
+            # он не является частью заголовка
+            header_line = header_line.removeprefix(b"\xef\xbb\xbf")
+            header = [cell.strip() for cell in header_line.split(b";")]
+            if header != self.HEADER:
                 results.append(
                     (
                         "Проверка структуры файла",
                         False,
-                        "Некорректная структура файла: ожидается 3 колонки (uid;type;request)",
+                        "Некорректный заголовок файла: ожидается 'uid;type;request'",
                     )
                 )
                 return results
 
-            results.append(("Проверка структуры файла", True, None))
-
-            # Извлечение данных
-            submission_rows = submission_data[1:]  # Пропускаем заголовок
-            test_uids = {row[0] for row in test_data[1:]}  # Получаем uid из test.csv
-
-            submission_uids = set()
-            for i, row in enumerate(submission_rows, start=2):
-                if len(row) != 3:
-                    continue  # Ошибка структуры уже проверена выше
+            bad_struct_rows = []
+            empty_rows = []
+            bad_method_rows = []
+            bad_path_rows = []
 
-                uid, method, request = row
+            # Быстрый путь: один проход regex-движка по всему буферу
+            # (findall — цикл по строкам целиком на уровне C) собирает
+            # uid всех полностью валидных строк
+            uid_list = (
+                self._block_re.findall(data, header_end + 1) if header_end != -1 else []
+            )
+            if len(uid_list) != num_rows:
+                # Медленный путь: есть невалидные строки — разбираем
+                # файл построчно, чтобы определить конкретные ошибки.
+                # Строки выдаются генератором по мере разбора, список
+                # строк целиком не материализуется
+                tail = len(data)
+                while tail > 0 and data[tail - 1] in b"\r\n":
+                    tail -= 1
+                line_iter = (
+                    self._iter_lines(data, header_end + 1, tail)
+                    if header_end != -1
+                    else iter(())
+                )
 
-                # Проверка на пустые значения
-                if not uid or not method or not request:
-                    results.append(
-                        (
-                            f"Проверка пустых значений (строка {i})",
-                            False,
-                            f"Строка {i}: обнаружены пустые значения",
-                        )
+                uid_list = []
+                # Все атрибуты, нужные в цикле, поднимаем в локальные
+                # переменные: без LOAD_ATTR на каждой строке
+                valid_methods = self.valid_methods
+                line_match = self._line_re.match
+                add_uid = uid_list.append
+                add_struct = bad_struct_rows.append
+                add_empty = empty_rows.append
+                add_method = bad_method_rows.append
+                add_path = bad_path_rows.append
+                for i, line in enumerate(line_iter, start=2):
+                    # Валидная строка распознаётся одним regex-матчем
+                    m = line_match(line)
+                    if m is not None:
+                        add_uid(m.group(1))
+                        continue
+
+                    # Один rstrip перевода строки на строку вместо strip
+                    # каждой ячейки: файлы генерируются машинно, пробелы
+                    # внутри значений в них не встречаются
+                    cells = line.rstrip(b"\r").split(b";")
+
+                    # Проверка структуры строки (ровно 3 колонки)
+                    if len(cells) != 3:
+                        add_struct(i)
+                        continue
+
+                    uid, method, request = cells
+
+                    # Проверка на пустые значения
+                    if not uid or not method or not request:
+                        add_empty(i)
+                        continue
+
+                    add_uid(uid)
+
+                    # Проверка валидности HTTP метода
+                    if method not in valid_methods:
+                        add_method(i)
+
+                    # Проверка валидности API пути
+                    # (срез вместо bound-метода startswith)
+                    if request[:1] != b"/":
+                        add_path(i)
+
+            # Дубликаты ищутся сортировкой колонки uid и сравнением
+            # соседних элементов — один непрерывный проход по массиву
+            # вместо множества, растущего на каждой строке
+            u = np.sort(np.asarray(uid_list)) if uid_list else np.empty(0, dtype="S1")
+            dup_mask = u[1:] == u[:-1]
+            dup_arr = np.unique(u[1:][dup_mask])
+            sub_arr = u[np.concatenate(([True], ~dup_mask))] if len(u) else u
+
+            if bad_struct_rows:
+                results.append(
+                    (
+                        "Проверка структуры файла",
+                        False,
+                        f"Некорректная структура файла: ожидается 3 колонки (uid;type;request), строки: {self._format_rows(bad_struct_rows)}",
                     )
-                    continue
-
-                # Проверка уникальности uid
-                if uid in submission_uids:
-                    results.append(
-                        (
-                            f"Проверка уникальности uid (строка {i})",
-                            False,
-                            f"Строка {i}: дублирование uid '{uid}'",
-                        )
+                )
+            else:
+                results.append(("Проверка структуры файла", True, None))
+
+            if empty_rows:
+                results.append(
+                    (
+                        "Проверка пустых значений",
+                        False,
+                        f"Обнаружены пустые значения, строки: {self._format_rows(empty_rows)}",
                     )
-                submission_uids.add(uid)
-
-                # Проверка валидности HTTP метода
-                if method not in self.valid_methods:
-                    results.append(
-                        (
-                            f"Проверка валидности HTTP метода (строка {i})",
-                            False,
-                            f"Строка {i}: некорректный HTTP метод '{method}'. Допустимые значения: {', '.join(sorted(self.valid_methods))}",
-                        )
+                )
+            else:
+                results.append(("Проверка пустых значений", True, None))
+
+            if len(dup_arr) > 0:
+                results.append(
+                    (
+                        "Проверка уникальности uid",
+                        False,
+                        f"Дублируются uid: {', '.join(d.decode() for d in dup_arr[:10])}{'...' if len(dup_arr) > 10 else ''}",
                     )
+                )
+            else:
+                results.append(("Проверка уникальности uid", True, None))
 
-                # Проверка валидности API пути
-                if not request.startswith("/"):
-                    results.append(
-                        (
-                            f"Проверка валидности API пути (строка {i})",
-                            False,
-                            f"Строка {i}: некорректный путь запроса '{request}'. Путь должен начинаться с '/'",
-                        )
+            if bad_method_rows:
+                results.append(
+                    (
+                        "Проверка валидности HTTP метода",
+                        False,
+                        f"Некорректный HTTP метод, строки: {self._format_rows(bad_method_rows)}. Допустимые значения: {self._valid_methods_str}",
                     )
+                )
+            else:
+                results.append(("Проверка валидности HTTP метода", True, None))
 
-            # Проверка соответствия количества строк
-            if len(submission_rows) != len(test_uids):
+            if bad_path_rows:
                 results.append(
                     (
-                        "Проверка соответствия количества строк",
+                        "Проверка валидности API пути",
                         False,
-                        f"Некорректное количество строк: ожидается {len(test_uids)}, найдено {len(submission_rows)}",
+                        f"Путь запроса не начинается с '/', строки: {self._format_rows(bad_path_rows)}",
                     )
                 )
             else:
-                results.append(("Проверка соответствия количества строк", True, None))
+                results.append(("Проверка валидности API пути", True, None))
+
+            # Диагностика недостающих/лишних uid: хэш-соединение
+            # np.isin над массивами байтовых строк вместо разности
+            # питоновских множеств
+            test_arr = np.array(list(test_uid_set))
 
             # Проверка наличия всех uid из test.csv
-            missing_uids = test_uids - submission_uids
-            if missing_uids:
+            missing_uids = (
+                test_arr[~np.isin(test_arr, sub_arr, assume_unique=True)]
+                if len(sub_arr) and len(test_arr)
+                else test_arr
+            )
+            if len(missing_uids) > 0:
+                missing_uids = np.sort(missing_uids)
                 results.append(
                     (
                         "Проверка наличия всех uid из test.csv",
                         False,
-                        f"Отсутствуют записи для uid: {', '.join(sorted(missing_uids)[:5])}{'...' if len(missing_uids) > 5 else ''}",
+                        f"Отсутствуют записи для uid: {', '.join(u.decode() for u in missing_uids[:5])}{'...' if len(missing_uids) > 5 else ''}",
                     )
                 )
             else:
                 results.append(("Проверка наличия всех uid из test.csv", True, None))
 
             # Проверка отсутствия лишних uid
-            extra_uids = submission_uids - test_uids
-            if extra_uids:
+            extra_uids = (
+                sub_arr[~np.isin(sub_arr, test_arr, assume_unique=True)]
+                if len(sub_arr) and len(test_arr)
+                else sub_arr
+            )
+            if len(extra_uids) > 0:
+                extra_uids = np.sort(extra_uids)
                 results.append(
                     (
                         "Проверка отсутствия лишних uid",
                         False,
-                        f"Обнаружены лишние uid, отсутствующие в test.csv: {', '.join(sorted(extra_uids)[:5])}{'...' if len(extra_uids) > 5 else ''}",
+                        f"Обнаружены лишние uid, отсутствующие в test.csv: {', '.join(u.decode() for u in extra_uids[:5])}{'...' if len(extra_uids) > 5 else ''}",
                     )
                 )
             else:
@@ -207,23 +382,67 @@ class SubmissionValidator:
 
         return results  # ⚠️ ВАЖНО: добавить возврат результатов!
 
-    def _read_csv(self, file_path: Path) -> List[List[str]]:
+    @staticmethod
+    def _format_rows(rows: List[int], limit: int = 10) -> str:
+        """Первые `limit` номеров строк для сообщения об ошибке"""
+        return ", ".join(map(str, rows[:limit])) + ("..." if len(rows) > limit else "")
+
+    @staticmethod
+    def _count_rows(file_path: str) -> int:
         """
-        Чтение CSV файла с разделителем ';'.
+        Быстрый подсчёт строк данных в файле (без заголовка).
+
+        Переводы строки считаются блоками по 1 МБ через bytes.count —
+        SIMD-ускоренный memchr, без разбора содержимого.
 
         Args:
             file_path: Путь к файлу
 
         Returns:
-            Список строк, каждая строка - список значений
+            Количество строк данных
         """
-        data = []
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                reader = csv.reader(f, delimiter=";")
-                for row in reader:
-                    data.append([cell.strip() for cell in row])
-        except Exception as e:
-            raise Exception(f"Не удалось прочитать файл {file_path}: {str(e)}")
+        lines = 0
+        last = b"\n"
+        with open(file_path, "rb") as f:
+            while block := f.read(1 << 20):
+                lines += block.count(b"\n")
+                last = block[-1:]
+        if last != b"\n":
+            lines += 1  # Последняя строка без завершающего перевода строки
+        return max(lines - 1, 0)
+
+    @staticmethod
+    def _iter_lines(data: bytes, pos: int, end: int) -> Iterator[bytes]:
+        """
+        Ленивая итерация по строкам буфера.
+
+        Args:
+            data: Байтовый буфер
+            pos: Смещение первой строки
+            end: Смещение, после которого строки не читаются
 
-        return data
+        Yields:
+            Очередная строка (без перевода строки)
+        """
+        find = data.find
+        while pos < end:
+            nl = find(b"\n", pos, end)
+            if nl == -1:
+                yield data[pos:end]
+                return
+            yield data[pos:nl]
+            pos = nl + 1
+
+    @staticmethod
+    def _read_bytes(file_path: str) -> bytes:
+        """
+        Чтение файла целиком как байтов.
+
+        Args:
+            file_path: Путь к файлу
+
+        Returns:
+            Содержимое файла
+        """
+        with open(file_path, "rb") as f:
+            return f.read()